@@ -0,0 +1,90 @@
+"""
+Persistent cache of PDFRouter verdicts, keyed by file content.
+
+Streamlit reruns the whole app on every interaction, and the same upload is
+often routed many times. Classification only needs a content fingerprint to
+be reused, so verdicts are stored in memory and mirrored to a small JSON
+file under ~/.cache/vibe_parser so they survive restarts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "vibe_parser", "router.json")
+MAX_ENTRIES = 512
+
+# Bytes hashed from each end of the file. The head covers the first pages and
+# the tail covers the xref table and trailer, whose /ID differs per document.
+_SAMPLE_SIZE = 1 << 20
+
+_lock = threading.Lock()
+_verdicts: Optional[Dict[str, str]] = None
+
+
+def make_key(pdf_path: str, version: str) -> Optional[str]:
+    """
+    Build a cache key from the file size and a BLAKE2b digest of its head and tail.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        version: Version of the classification heuristics, so verdicts from
+            older rules are never reused.
+
+    Returns:
+        The cache key, or None if the file cannot be read.
+    """
+    try:
+        size = os.path.getsize(pdf_path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(pdf_path, 'rb') as f:
+            digest.update(f.read(_SAMPLE_SIZE))
+            if size > _SAMPLE_SIZE:
+                f.seek(max(_SAMPLE_SIZE, size - _SAMPLE_SIZE))
+                digest.update(f.read())
+    except OSError:
+        return None
+    return f"{version}-{digest.hexdigest()}-{size}"
+
+
+def _load() -> Dict[str, str]:
+    global _verdicts
+    if _verdicts is None:
+        try:
+            with open(CACHE_PATH, 'r') as f:
+                data = json.load(f)
+            _verdicts = {k: v for k, v in data.items() if v in ("NATIVE", "SCANNED")}
+        except (OSError, ValueError, AttributeError):
+            _verdicts = {}
+    return _verdicts
+
+
+def lookup(key: Optional[str]) -> Optional[str]:
+    """Return the cached verdict for key, or None on a miss."""
+    if key is None:
+        return None
+    with _lock:
+        return _load().get(key)
+
+
+def store(key: Optional[str], verdict: str) -> None:
+    """Record a verdict and write the cache file; write failures are ignored."""
+    if key is None:
+        return
+    with _lock:
+        verdicts = _load()
+        verdicts.pop(key, None)
+        verdicts[key] = verdict
+        # Dicts keep insertion order, so the first keys are the oldest
+        for stale in list(verdicts)[:-MAX_ENTRIES]:
+            del verdicts[stale]
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(verdicts, f)
+            os.replace(tmp_path, CACHE_PATH)
+        except OSError:
+            pass
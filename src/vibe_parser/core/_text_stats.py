@@ -0,0 +1,60 @@
+"""
+Character statistics used by the router's text quality score.
+
+Counting runs in compiled code: a Numba kernel when numba is installed, and
+bytes.translate or a regex substitution otherwise.
+"""
+
+import re
+from typing import Tuple
+
+try:
+    import numpy as np
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# ASCII bytes that are not alphanumeric; deleting them with bytes.translate
+# leaves exactly the characters str.isalnum() would count.
+_ASCII_NON_ALNUM = bytes(b for b in range(128) if not chr(b).isalnum())
+
+# Unicode fallback: [^\W_] matches exactly what str.isalnum() accepts.
+_NON_ALNUM_RE = re.compile(r'[\W_]+')
+
+if NUMBA_AVAILABLE:
+    # An explicit signature compiles the kernel when this module is imported
+    # (or loads it from numba's on-disk cache), so the first document routed
+    # does not pay the JIT latency. np.frombuffer views of bytes are read-only.
+    _KERNEL_SIGNATURE = types.UniTuple(types.int64, 2)(types.Array(types.uint8, 1, 'C', readonly=True))
+
+    @njit(_KERNEL_SIGNATURE, cache=True, nogil=True)
+    def _count_ascii_kernel(buf):
+        """Count ASCII alphanumeric and space bytes in one pass."""
+        alnum = 0
+        spaces = 0
+        for i in range(buf.size):
+            c = buf[i]
+            alnum += ((c >= 0x30) & (c <= 0x39)) | ((c >= 0x41) & (c <= 0x5A)) | ((c >= 0x61) & (c <= 0x7A))
+            spaces += c == 0x20
+        return alnum, spaces
+
+
+def count_alnum_space(text: str) -> Tuple[int, int]:
+    """
+    Count alphanumeric characters and spaces in text.
+
+    Args:
+        text: Text to analyze.
+
+    Returns:
+        Tuple of (alphanumeric_count, space_count)
+    """
+    if not text.isascii():
+        return len(_NON_ALNUM_RE.sub('', text)), text.count(' ')
+
+    data = text.encode('ascii')
+    if NUMBA_AVAILABLE:
+        alnum, spaces = _count_ascii_kernel(np.frombuffer(data, dtype=np.uint8))
+        return int(alnum), int(spaces)
+    return len(data.translate(None, _ASCII_NON_ALNUM)), data.count(b' ')
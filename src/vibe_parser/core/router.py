@@ -1,7 +1,61 @@
 import fitz  # pymupdf
+import hashlib
+import logging
+import numpy as np
 import sys
-from typing import Literal
-import math
+from typing import List, Literal, Optional
+import dataclasses
+from dataclasses import dataclass
+
+from src.vibe_parser.core import _router_cache
+from src.vibe_parser.core._text_stats import count_alnum_space
+from src.vibe_parser.models.config import RouterConfig
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the heuristics change so cached verdicts are invalidated
+HEURISTICS_VERSION = "7"
+
+# Default text extraction flags plus image blocks, so one text page serves
+# both the text and the image measurements. Dropping ligature/whitespace
+# preservation makes MuPDF rewrite those glyphs instead of skipping work,
+# and neither text sorting nor dehyphenation is enabled by default.
+_TEXTPAGE_FLAGS = fitz.TEXTFLAGS_BLOCKS | fitz.TEXT_PRESERVE_IMAGES
+
+@dataclass
+class _PageStats:
+    """Per-page measurements gathered in a single pass."""
+    text_area: float
+    text_len: int
+    alnum: int
+    space: int
+    image_count: int
+    image_area: float
+    page_area: float
+
+def _sample_pages(total_pages: int, count: int) -> List[int]:
+    """
+    Pick up to count page indices spread evenly across the document, always
+    including the first and last page, so a native cover page cannot hide
+    scanned pages behind it.
+    """
+    if total_pages <= 0:
+        return []
+    return np.linspace(0, total_pages - 1, min(count, total_pages), dtype=int).tolist()
+
+def _total_area(rects, clip=None) -> float:
+    """
+    Sum the areas of (x0, y0, x1, y1) rows in one vectorised pass.
+    Inverted rectangles count as zero, matching fitz.Rect.get_area().
+    If clip is given, only the part of each rectangle inside it is counted.
+    """
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    if clip is not None:
+        rects[:, 0::2] = np.clip(rects[:, 0::2], clip.x0, clip.x1)
+        rects[:, 1::2] = np.clip(rects[:, 1::2], clip.y0, clip.y1)
+    widths = np.clip(rects[:, 2] - rects[:, 0], 0.0, None)
+    heights = np.clip(rects[:, 3] - rects[:, 1], 0.0, None)
+    return float(np.dot(widths, heights))
 
 class PDFRouter:
     """
@@ -9,162 +63,151 @@ class PDFRouter:
     Uses enhanced heuristics for more accurate classification.
     """
 
-    def _calculate_text_quality_score(self, doc) -> float:
-        """
-        Calculate a quality score for text content to distinguish between 
-        readable text and OCR artifacts/gibberish.
-        
-        Returns:
-            float: Score between 0-1, where higher means better quality text
-        """
-        total_chars = 0
-        valid_word_chars = 0
-        space_count = 0
-        
-        # Check first few pages
-        pages_to_check = min(3, len(doc))
-        
-        for i in range(pages_to_check):
-            page = doc[i]
-            text = page.get_text()
-            
-            total_chars += len(text)
-            space_count += text.count(' ')
-            
-            # Count alphanumeric characters (good indicator of real text)
-            for char in text:
-                if char.isalnum():
-                    valid_word_chars += 1
-        
-        if total_chars == 0:
-            return 0.0
-            
-        # Calculate ratios
-        alpha_ratio = valid_word_chars / total_chars if total_chars > 0 else 0
-        space_ratio = space_count / total_chars if total_chars > 0 else 0
-        
-        # Weighted score - prioritize alpha ratio but consider spacing too
-        quality_score = (alpha_ratio * 0.7) + (space_ratio * 0.3)
-        
-        return quality_score
+    def __init__(self, config: Optional[RouterConfig] = None, use_cache: bool = True):
+        self.config = config or RouterConfig()
+        # Verdicts are cached by file content, see _router_cache. The key
+        # includes the thresholds so retuned configs never reuse old verdicts
+        self.use_cache = use_cache
+        thresholds = repr(dataclasses.astuple(self.config)).encode()
+        self._cache_version = f"{HEURISTICS_VERSION}.{hashlib.blake2b(thresholds, digest_size=4).hexdigest()}"
 
-    def _analyze_image_content(self, doc) -> dict:
+    def _gather_page_stats(self, page) -> _PageStats:
         """
-        Analyze image content to detect scanned documents.
+        Collect everything the heuristics need from a page in one pass.
+        A single text page with image blocks supplies the text blocks, the
+        raw text and the image placements, so MuPDF interprets the content
+        stream only once.
         
         Returns:
-            dict: Contains image analysis metrics
+            _PageStats: Text, image and area measurements for the page
         """
-        total_pages = len(doc)
-        pages_to_check = min(3, total_pages)
+        textpage = page.get_textpage(flags=_TEXTPAGE_FLAGS)
         
-        image_count = 0
-        total_images_area = 0.0
-        total_page_area = 0.0
+        # block is (x0, y0, x1, y1, "text", block_no, block_type)
+        # block_type 0 is text
+        text_blocks = [block for block in textpage.extractBLOCKS() if block[6] == 0]
+        text = "".join(block[4] for block in text_blocks)
+        alnum, space = count_alnum_space(text)
         
-        for i in range(pages_to_check):
-            page = doc[i]
-            page_rect = page.rect
-            total_page_area += page_rect.get_area()
-            
-            # Get images on page
-            images = page.get_images()
-            image_count += len(images)
-            
-            # Calculate total image area
-            for img in images:
-                # Get image bbox
-                try:
-                    img_bbox = page.get_image_bbox(img)
-                    total_images_area += img_bbox.get_area()
-                except:
-                    # If we can't get bbox, estimate
-                    total_images_area += page_rect.get_area() * 0.5  # Assume 50% coverage
+        # Image placements are not clipped by MuPDF; count only the visible
+        # part so oversized or off-page images cannot inflate the ratio
+        page_rect = page.rect
+        image_infos = textpage.extractIMGINFO()
         
-        return {
-            'image_count': image_count,
-            'images_area_ratio': total_images_area / total_page_area if total_page_area > 0 else 0,
-            'avg_images_per_page': image_count / pages_to_check if pages_to_check > 0 else 0
-        }
+        return _PageStats(
+            text_area=_total_area([block[:4] for block in text_blocks]),
+            text_len=len(text),
+            alnum=alnum,
+            space=space,
+            image_count=len(image_infos),
+            image_area=_total_area([info['bbox'] for info in image_infos], clip=page_rect),
+            page_area=page_rect.get_area(),
+        )
 
-    def identify_type(self, pdf_path: str) -> Literal["NATIVE", "SCANNED"]:
+    def identify_type(self, pdf_path: str, doc: Optional[fitz.Document] = None) -> Literal["NATIVE", "SCANNED"]:
         """
         Identifies if a PDF is NATIVE (selectable text) or SCANNED (image-based).
         Uses multiple heuristics for more accurate detection.
         
         Args:
             pdf_path: Path to the PDF file.
+            doc: Optional document already opened from pdf_path. It is used
+                instead of parsing the file again and is left open for the
+                caller.
             
         Returns:
             'NATIVE' or 'SCANNED'
         """
+        cache_key = _router_cache.make_key(pdf_path, self._cache_version) if self.use_cache else None
+        cached = _router_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            doc = fitz.open(pdf_path)
-            total_pages = len(doc)
-            if total_pages == 0:
-                return "SCANNED"
+            if doc is not None:
+                pdf_type = self._classify(doc)
+            else:
+                with fitz.open(pdf_path) as doc:
+                    pdf_type = self._classify(doc)
+        except Exception as e:
+            print(f"Error identifying PDF type: {e}", file=sys.stderr)
+            return "SCANNED"  # Fallback, not cached so a later retry can succeed
 
-            total_text_area = 0.0
-            total_page_area = 0.0
-            
-            # Check first few pages to save time on large docs
-            pages_to_check = min(5, total_pages)
-            
-            for i in range(pages_to_check):
-                page = doc[i]
-                page_rect = page.rect
-                total_page_area += page_rect.get_area()
-                
-                # Get all text blocks
-                text_blocks = page.get_text("blocks")
-                for block in text_blocks:
-                    # block is (x0, y0, x1, y1, "text", block_no, block_type)
-                    # block_type 0 is text
-                    if block[6] == 0:
-                        r = fitz.Rect(block[:4])
-                        total_text_area += r.get_area()
-
-            if total_page_area == 0:
-                doc.close()
-                return "SCANNED"
-
-            text_density = (total_text_area / total_page_area) * 100
-            
-            # Get text quality score
-            text_quality = self._calculate_text_quality_score(doc)
-            
-            # Analyze image content
-            image_analysis = self._analyze_image_content(doc)
-            
-            doc.close()
-            
-            # Enhanced decision logic:
-            # 1. Low text density strongly suggests scanned
-            if text_density < 2.0:
-                return "SCANNED"
-            
-            # 2. High text density with poor quality suggests OCR artifacts
-            if text_density > 5.0 and text_quality < 0.3:
-                return "SCANNED"
-            
-            # 3. Significant image content suggests scanned
-            if image_analysis['images_area_ratio'] > 0.7:
-                return "SCANNED"
-            
-            # 4. Very high text density with good quality suggests native
-            if text_density > 10.0 and text_quality > 0.4:
-                return "NATIVE"
-            
-            # 5. Moderate text density with good quality suggests native
-            if text_density > 3.0 and text_quality > 0.5:
-                return "NATIVE"
-            
-            # Default to scanned for safety
+        _router_cache.store(cache_key, pdf_type)
+        return pdf_type
+
+    def _classify(self, doc) -> Literal["NATIVE", "SCANNED"]:
+        """
+        Apply the classification heuristics to an open document.
+
+        Args:
+            doc: Open PyMuPDF document.
+
+        Returns:
+            'NATIVE' or 'SCANNED'
+        """
+        total_pages = doc.page_count
+        if total_pages == 0:
             return "SCANNED"
 
-        except Exception as e:
-            print(f"Error identifying PDF type: {e}", file=sys.stderr)
-            return "SCANNED"  # Fallback
+        # Check a few pages, spread from first to last, to save time on
+        # large docs. Pages are walked serially on purpose: PyMuPDF holds the
+        # GIL and is not thread-safe, even with one Document per thread, and
+        # a process pool costs more to start than analysing five pages.
+        sampled = _sample_pages(total_pages, 5)
+        stats = [self._gather_page_stats(doc.load_page(i)) for i in sampled]
+        
+        total_page_area = sum(s.page_area for s in stats)
+        if total_page_area == 0:
+            return "SCANNED"
+
+        text_density = (sum(s.text_area for s in stats) / total_page_area) * 100
+        
+        # Quality score between 0-1: prioritize the alphanumeric ratio (a
+        # good indicator of real text) but consider spacing too
+        total_chars = sum(s.text_len for s in stats)
+        if total_chars == 0:
+            text_quality = 0.0
+        else:
+            alpha_ratio = sum(s.alnum for s in stats) / total_chars
+            space_ratio = sum(s.space for s in stats) / total_chars
+            text_quality = (alpha_ratio * 0.7) + (space_ratio * 0.3)
+        
+        images_area_ratio = sum(s.image_area for s in stats) / total_page_area
+        
+        # Enhanced decision logic, evaluated in order of the first rule that
+        # settles the verdict:
+        cfg = self.config
+        # 1. Low text density strongly suggests scanned
+        if text_density < cfg.min_text_density:
+            return self._verdict("SCANNED", "density", text_density)
+        
+        # 2. High text density with poor quality suggests OCR artifacts
+        if text_density > cfg.artifact_text_density and text_quality < cfg.artifact_max_quality:
+            return self._verdict("SCANNED", "quality", text_density, text_quality)
+        
+        # 3. Very high text density with good quality suggests native,
+        #    as does moderate text density with good quality
+        native_candidate = (
+            (text_density > cfg.high_text_density and text_quality > cfg.high_min_quality)
+            or (text_density > cfg.moderate_text_density and text_quality > cfg.moderate_min_quality)
+        )
+        if not native_candidate:
+            # Default to scanned for safety; image content cannot change that
+            return self._verdict("SCANNED", "default", text_density, text_quality)
+        
+        # 4. Significant image content still suggests scanned
+        if images_area_ratio > cfg.max_image_ratio:
+            return self._verdict("SCANNED", "images", text_density, text_quality, images_area_ratio)
+        
+        return self._verdict("NATIVE", "native", text_density, text_quality, images_area_ratio)
+
+    @staticmethod
+    def _verdict(pdf_type: str, stage: str, *metrics: float) -> Literal["NATIVE", "SCANNED"]:
+        """Log which rule decided the classification, for threshold tuning."""
+        logger.debug("Classified as %s at stage '%s' (metrics: %s)", pdf_type, stage,
+                     ", ".join(f"{m:.3f}" for m in metrics))
+        return pdf_type
 
 if __name__ == "__main__":
     # Simple test block
@@ -1,11 +1,16 @@
 import json
-import pandas as pd
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
-from docling.document_converter import DocumentConverter
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
 import tempfile
 import os
 
+# pandas and docling are imported where they are used, so importing this
+# module does not pay for them up front
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Import our new preprocessing module
 try:
     from src.vibe_parser.utils.preprocessing import OCRPreprocessor
@@ -25,6 +30,34 @@ except ImportError:
 # Import configuration
 from src.vibe_parser.models.config import ExtractionConfig
 
+@lru_cache(maxsize=4)
+def _build_converter(do_ocr: bool, fast_mode: bool):
+    """
+    Build a DocumentConverter for the given pipeline settings.
+
+    Converters are cached per process, so every extractor with the same
+    settings shares one set of loaded layout and OCR models.
+    """
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+    from docling.datamodel.base_models import InputFormat
+    from docling.document_converter import PdfFormatOption
+
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = do_ocr
+    pipeline_options.do_table_structure = False  # Disable for speed
+    
+    # Performance optimizations
+    if fast_mode:
+        pipeline_options.images_scale = 0.5  # Reduce image processing
+        pipeline_options.generate_picture_images = False  # Skip picture generation
+    
+    format_options = {
+        InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+    }
+    
+    from docling.document_converter import DocumentConverter
+    return DocumentConverter(format_options=format_options)
+
 class DoclingExtractor:
     """
     Heavy lifter for complex document extraction using Docling.
@@ -33,33 +66,10 @@ class DoclingExtractor:
     """
     def __init__(self, config: ExtractionConfig = None):
         self.config = config or ExtractionConfig()
-        # Initialize converter once for better performance
-        self.converter = None
 
     def _get_converter(self, do_ocr: bool = True, fast_mode: bool = True):
-        """Get or create converter with optimized settings."""
-        if self.converter is None:
-            from docling.datamodel.pipeline_options import PdfPipelineOptions
-            from docling.datamodel.base_models import InputFormat
-            from docling.document_converter import PdfFormatOption
-
-            pipeline_options = PdfPipelineOptions()
-            pipeline_options.do_ocr = do_ocr and self.config.ocr.enabled
-            pipeline_options.do_table_structure = False  # Disable for speed
-            
-            # Performance optimizations
-            if fast_mode:
-                pipeline_options.images_scale = 0.5  # Reduce image processing
-                pipeline_options.generate_picture_images = False  # Skip picture generation
-            
-            format_options = {
-                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-            }
-            
-            from docling.document_converter import DocumentConverter
-            self.converter = DocumentConverter(format_options=format_options)
-        
-        return self.converter
+        """Get the shared converter for these settings."""
+        return _build_converter(bool(do_ocr and self.config.ocr.enabled), bool(fast_mode))
 
     def extract_complex_pdf(self, file_path: str, do_ocr: bool = True, fast_mode: bool = True) -> Tuple[str, Dict[str, Any]]:
         """
@@ -79,7 +89,13 @@ class DoclingExtractor:
         # Skip preprocessing entirely for maximum speed
         processed_file_path = file_path
         
-        result = converter.convert(processed_file_path)
+        # Convert only the leading pages when a page limit is configured, so
+        # the rest of the document is never parsed, exported or cleaned
+        max_pages = self.config.performance.max_pages
+        if max_pages:
+            result = converter.convert(processed_file_path, page_range=(1, max_pages))
+        else:
+            result = converter.convert(processed_file_path)
         
         # Export to Markdown
         markdown_content = result.document.export_to_markdown()
@@ -117,13 +133,70 @@ class DoclingExtractor:
                 "quality_metrics": {"overall": 0.7}  # Higher default since we're using Docling
             }
 
-    def extract_tables(self, doc_result_dict: Dict[str, Any]) -> List[pd.DataFrame]:
+    def extract_tables(self, doc_result_dict: Dict[str, Any]) -> List["pd.DataFrame"]:
         """
         Helper function to extract tables as Pandas DataFrames.
         """
         pass
 
-def extract_tables_from_result(result) -> List[pd.DataFrame]:
+# Cell text that converts to a number and formats back unchanged: no
+# leading zeros, signs other than '-', exponents, spaces or inf/nan
+_INTEGER_CELL_RE = re.compile(r'0|-?[1-9][0-9]*')
+_DECIMAL_CELL_RE = re.compile(r'-?(?:0|[1-9][0-9]*)\.[0-9]+')
+
+def _to_numeric_exact(column: "pd.Series"):
+    """
+    Convert a text column to numbers, or return None if any value would change.
+
+    Empty cells become missing values. Integers use the smallest integer type,
+    nullable if cells are missing; decimals must survive a float round trip.
+    """
+    import pandas as pd
+
+    present = column.notna() & (column.astype(str) != '')
+    if not present.any():
+        return None
+    text = column[present].astype(str)
+    if text.str.fullmatch(_INTEGER_CELL_RE).all():
+        numbers = pd.to_numeric(text, downcast='integer')
+        if not pd.api.types.is_integer_dtype(numbers.dtype):
+            return None  # Out of int64 range
+        if not present.all():
+            numbers = numbers.astype(numbers.dtype.name.capitalize()).reindex(column.index)
+        return numbers
+    if text.str.fullmatch(_DECIMAL_CELL_RE).all():
+        numbers = pd.to_numeric(text)
+        if (numbers.map(repr) != text).any():
+            return None  # Trailing zeros or more digits than a float holds
+        return numbers.reindex(column.index)
+    return None
+
+def _downcast_dataframe(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Shrink a table exported by Docling, whose cells all arrive as text.
+
+    Columns whose values all convert exactly become integer (downcast) or
+    float64 columns, repetitive text columns become categoricals and the
+    remaining text uses pandas' string dtype. Values such as "007" stay text.
+    """
+    import pandas as pd
+
+    if df.empty:
+        return df
+    # Go by position: table headers are not guaranteed to be unique
+    for i, dtype in enumerate(df.dtypes):
+        if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+            continue
+        column = df.iloc[:, i]
+        numbers = _to_numeric_exact(column)
+        if numbers is not None:
+            df.isetitem(i, numbers)
+        elif column.nunique() / len(df) < 0.5:
+            df.isetitem(i, column.astype('category'))
+    # Leave the downcast numbers alone; convert_dtypes would widen them again
+    return df.convert_dtypes(convert_integer=False, convert_floating=False)
+
+def extract_tables_from_result(result) -> List["pd.DataFrame"]:
     """
     Extracts tables from a Docling conversion result as Pandas DataFrames.
     
@@ -138,7 +211,7 @@ def extract_tables_from_result(result) -> List[pd.DataFrame]:
     for table in result.document.tables:
         # Export table to dataframe
         df = table.export_to_dataframe()
-        tables.append(df)
+        tables.append(_downcast_dataframe(df))
     return tables
 
 # Script section for direct execution
@@ -3,11 +3,21 @@ Configuration models for the VibeParser system.
 """
 
 import os
+import sys
 import json
-from pydantic import BaseModel
+import dataclasses
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
-class OCRConfig(BaseModel):
+# Configs are plain frozen dataclasses: building the defaults involves no
+# validation work, and frozen instances are hashable, so they can key caches.
+# __slots__ generation needs Python 3.10+.
+_CONFIG_OPTIONS = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _CONFIG_OPTIONS["slots"] = True
+
+@dataclass(**_CONFIG_OPTIONS)
+class OCRConfig:
     """Configuration for OCR processing."""
     enabled: bool = True
     engine: str = "default"  # Options: "default", "tesseract", "easyocr"
@@ -15,13 +25,15 @@ class OCRConfig(BaseModel):
     lang: str = "en"
     tess_cmd: Optional[str] = None  # Custom tesseract command
     
-class TableConfig(BaseModel):
+@dataclass(**_CONFIG_OPTIONS)
+class TableConfig:
     """Configuration for table extraction."""
     enabled: bool = True
     structure_only: bool = False
     html_output: bool = False
     
-class PreprocessingConfig(BaseModel):
+@dataclass(**_CONFIG_OPTIONS)
+class PreprocessingConfig:
     """Configuration for image preprocessing."""
     enabled: bool = True
     denoise: bool = True
@@ -29,23 +41,49 @@ class PreprocessingConfig(BaseModel):
     binarization: bool = True
     noise_removal: bool = True
     
-class PerformanceConfig(BaseModel):
+@dataclass(**_CONFIG_OPTIONS)
+class PerformanceConfig:
     """Configuration for performance optimization."""
     fast_mode: bool = False
     max_pages: Optional[int] = None
     timeout_seconds: int = 300  # 5 minutes default timeout
     
-class ExtractionConfig(BaseModel):
+@dataclass(**_CONFIG_OPTIONS)
+class RouterConfig:
+    """Thresholds used by PDFRouter to classify documents."""
+    min_text_density: float = 2.0  # Below this text coverage (% of page) -> scanned
+    artifact_text_density: float = 5.0  # Above this with poor quality -> OCR artifacts
+    artifact_max_quality: float = 0.3
+    max_image_ratio: float = 0.7  # Image coverage above this -> scanned
+    high_text_density: float = 10.0  # Native if quality also exceeds high_min_quality
+    high_min_quality: float = 0.4
+    moderate_text_density: float = 3.0  # Native if quality also exceeds moderate_min_quality
+    moderate_min_quality: float = 0.5
+    
+@dataclass(**_CONFIG_OPTIONS)
+class ExtractionConfig:
     """Main configuration for PDF extraction."""
-    ocr: OCRConfig = OCRConfig()
-    tables: TableConfig = TableConfig()
-    preprocessing: PreprocessingConfig = PreprocessingConfig()
-    performance: PerformanceConfig = PerformanceConfig()
+    ocr: OCRConfig = field(default_factory=OCRConfig)
+    tables: TableConfig = field(default_factory=TableConfig)
+    preprocessing: PreprocessingConfig = field(default_factory=PreprocessingConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    router: RouterConfig = field(default_factory=RouterConfig)
     # Add more configuration options as needed
-    
-    class Config:
-        # Allow arbitrary types for flexibility
-        arbitrary_types_allowed = True
+
+def _from_dict(config_cls, data: Dict[str, Any]):
+    """
+    Build a config dataclass from parsed JSON, recursing into nested sections.
+    Unknown keys are ignored, as they were with the previous pydantic models.
+    """
+    kwargs = {}
+    for f in dataclasses.fields(config_cls):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        if isinstance(f.type, type) and dataclasses.is_dataclass(f.type) and isinstance(value, dict):
+            value = _from_dict(f.type, value)
+        kwargs[f.name] = value
+    return config_cls(**kwargs)
 
 # Default configuration
 DEFAULT_CONFIG = ExtractionConfig()
@@ -64,7 +102,7 @@ def load_config(config_path: Optional[str] = None) -> ExtractionConfig:
         try:
             with open(config_path, 'r') as f:
                 config_data = json.load(f)
-            return ExtractionConfig(**config_data)
+            return _from_dict(ExtractionConfig, config_data)
         except Exception as e:
             print(f"Warning: Failed to load config from {config_path}: {e}")
             print("Using default configuration.")
@@ -3,20 +3,101 @@ Utilities for post-processing extracted text to improve quality and structure.
 """
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Any
-import nltk
 from collections import Counter
 
-# Download required NLTK data (run once)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+@lru_cache(maxsize=None)
+def _ensure_nltk_data(resource: str, package: str) -> None:
+    """
+    Import NLTK and download required data on first use (run once).
+    Deferred from import time so loading this module stays cheap; raises
+    ImportError if NLTK is not installed.
+    """
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package)
+
+# Common OCR misreads, ligatures and typographic characters, applied in a
+# single str.translate pass
+_OCR_REPLACEMENTS = str.maketrans({
+    '|': 'I',
+    'ﬁ': 'fi',
+    'ﬂ': 'fl',
+    '\uf0b7': '•',  # Bullet point
+    '\u2022': '•',   # Bullet point
+    '\u2013': '-',   # En dash
+    '\u2014': '--',  # Em dash
+})
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Isolated special characters that are likely OCR artifacts
+_ARTIFACT_RE = re.compile(r'\s[^\w\s]{1,2}\s')
+
+# Sentence terminators for the simple (non-NLTK) splitter
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+def _iter_simple_sentences(paragraph: str):
+    """
+    Yield the substantial sentences of a paragraph, scanning the terminators
+    in place instead of materialising a full re.split() list.
+    """
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(paragraph):
+        cleaned = paragraph[start:match.start()].strip()
+        if len(cleaned) > 10:  # Only consider substantial parts as sentences
+            yield cleaned + "."
+        start = match.end()
+    cleaned = paragraph[start:].strip()
+    if len(cleaned) > 10:
+        yield cleaned + "."
+
+# Heading patterns for _identify_sections, tried in this order
+_HEADING_RE = re.compile(
+    r'(?:^[A-Z][A-Za-z\s]{0,50}[.:]?$)'  # All caps or title case short lines
+    r'|(?:^\d+\.\s+[A-Z].*$)'            # Numbered headings
+    r'|(?:^[A-Z].*\n={3,}$)'              # Underlined headings
+)
+
+# Candidate keywords: words of three or more ASCII letters
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Fallback stopwords list
+_FALLBACK_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'})
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+@lru_cache(maxsize=1)
+def _get_stop_words() -> frozenset:
+    """Load the English stopwords once per process."""
+    try:
+        _ensure_nltk_data('corpora/stopwords', 'stopwords')
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words('english'))
+    except:
+        return _FALLBACK_STOP_WORDS
+
+def _most_common_words(word_freq: Counter, k: int) -> List[str]:
+    """
+    Return the k most frequent words, in the same order as most_common(k).
+
+    np.partition finds the k-th largest count in linear time. Only words at
+    or above it are sorted, stably, so ties keep first-seen order.
+    """
+    if k <= 0 or not word_freq:
+        return []
+    import numpy as np
+
+    counts = np.fromiter(word_freq.values(), dtype=np.int64, count=len(word_freq))
+    if k < len(counts):
+        threshold = np.partition(counts, len(counts) - k)[len(counts) - k]
+        candidates = np.flatnonzero(counts >= threshold)
+    else:
+        candidates = np.arange(len(counts))
+    top = candidates[np.argsort(-counts[candidates], kind='stable')[:k]]
+    words = list(word_freq)
+    return [words[i] for i in top]
 
 class TextPostProcessor:
     """
@@ -39,32 +120,19 @@ class TextPostProcessor:
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove excessive whitespace; this also turns every \r and \n into
+        # a single space, so line endings need no separate normalization
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
         
         # Fix common OCR artifacts
         # Replace common OCR misreads
-        replacements = {
-            '|': 'I',
-            'ﬁ': 'fi',
-            'ﬂ': 'fl',
-            '\uf0b7': '•',  # Bullet point
-            '\u2022': '•',   # Bullet point
-            '\u2013': '-',   # En dash
-            '\u2014': '--',  # Em dash
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        text = text.translate(_OCR_REPLACEMENTS)
         
         # Remove isolated special characters that are likely OCR artifacts
-        text = re.sub(r'\s[^\w\s]{1,2}\s', ' ', text)
-        
-        # Normalize line endings
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        text = _ARTIFACT_RE.sub(' ', text)
         
         return text
     
@@ -90,9 +158,13 @@ class TextPostProcessor:
         # Extract sentences
         sentences = []
         try:
+            _ensure_nltk_data('tokenizers/punkt', 'punkt')
             from nltk.tokenize import sent_tokenize
-            for paragraph in paragraphs:
-                sentences.extend(sent_tokenize(paragraph))
+            # Tokenize all paragraphs in one call, then cut at the paragraph
+            # breaks again: a paragraph end always ends a sentence, and the
+            # paragraphs themselves never contain a blank line
+            for sentence in sent_tokenize('\n\n'.join(paragraphs)):
+                sentences.extend(part for part in sentence.split('\n\n') if part)
         except:
             # Fallback if NLTK is not available
             sentences = self._simple_sentence_splitting(paragraphs)
@@ -123,20 +195,9 @@ class TextPostProcessor:
         sections = []
         current_section = {"title": "Introduction", "content": []}
         
-        heading_patterns = [
-            r'^[A-Z][A-Za-z\s]{0,50}[.:]?$',  # All caps or title case short lines
-            r'^\d+\.\s+[A-Z].*$',             # Numbered headings
-            r'^[A-Z].*\n={3,}$',              # Underlined headings
-        ]
-        
         for paragraph in paragraphs:
-            is_heading = False
-            
             # Check if paragraph matches heading patterns
-            for pattern in heading_patterns:
-                if re.match(pattern, paragraph.strip()):
-                    is_heading = True
-                    break
+            is_heading = _HEADING_RE.match(paragraph.strip()) is not None
             
             if is_heading:
                 # Save previous section
@@ -167,11 +228,7 @@ class TextPostProcessor:
         sentences = []
         for paragraph in paragraphs:
             # Split on periods, exclamation marks, and question marks
-            parts = re.split(r'[.!?]+', paragraph)
-            for part in parts:
-                cleaned = part.strip()
-                if len(cleaned) > 10:  # Only consider substantial parts as sentences
-                    sentences.append(cleaned + ".")
+            sentences.extend(_iter_simple_sentences(paragraph))
         return sentences
     
     def extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
@@ -187,20 +244,14 @@ class TextPostProcessor:
         """
         # Simple keyword extraction based on frequency
         # Remove common stopwords
-        try:
-            from nltk.corpus import stopwords
-            stop_words = set(stopwords.words('english'))
-        except:
-            # Fallback stopwords list
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'}
+        stop_words = _get_stop_words()
         
-        # Tokenize and clean words
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        filtered_words = [word for word in words if word not in stop_words]
+        # Filter and count in one pass without building a filtered-words list.
+        # findall still builds its token list, kept because finditer was slower
+        word_freq = Counter(word for word in _WORD_RE.findall(text.lower()) if word not in stop_words)
         
         # Get most common words
-        word_freq = Counter(filtered_words)
-        keywords = [word for word, freq in word_freq.most_common(num_keywords)]
+        keywords = _most_common_words(word_freq, num_keywords)
         
         return keywords
     
@@ -218,33 +269,43 @@ class TextPostProcessor:
             return {"readability": 0.0, "coherence": 0.0, "completeness": 0.0}
         
         # Basic readability metric (character to word ratio)
-        words = text.split()
+        word_count = len(text.split())
         chars = len(text)
         
-        if len(words) == 0:
+        if word_count == 0:
             readability = 0.0
         else:
-            avg_word_length = chars / len(words)
+            avg_word_length = chars / word_count
             # Ideal average word length is around 5 characters
             readability = max(0.0, 1.0 - abs(avg_word_length - 5) / 10)
         
         # Coherence metric (based on sentence structure)
-        sentences = self._simple_sentence_splitting([text])
-        if len(sentences) == 0:
+        # Sentences are streamed and only their counts kept, no list is built
+        sentence_count = 0
+        sentence_words = 0
+        for sentence in _iter_simple_sentences(text):
+            sentence_count += 1
+            sentence_words += len(sentence.split())
+        if sentence_count == 0:
             coherence = 0.0
         else:
             # Average sentence length in words
-            avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+            avg_sentence_length = sentence_words / sentence_count
             # Ideal average sentence length is around 20 words
             coherence = max(0.0, 1.0 - abs(avg_sentence_length - 20) / 50)
         
         # Completeness metric (based on content density)
-        paragraphs = [p for p in text.split('\n\n') if p.strip()]
-        if len(paragraphs) == 0:
+        paragraph_count = 0
+        paragraph_chars = 0
+        for p in text.split('\n\n'):
+            if p.strip():
+                paragraph_count += 1
+                paragraph_chars += len(p)
+        if paragraph_count == 0:
             completeness = 0.0
         else:
             # Average paragraph length
-            avg_paragraph_length = sum(len(p) for p in paragraphs) / len(paragraphs)
+            avg_paragraph_length = paragraph_chars / paragraph_count
             # Longer paragraphs suggest more complete content
             completeness = min(1.0, avg_paragraph_length / 200)
         
@@ -3,11 +3,28 @@ Utilities for preprocessing scanned PDFs to improve OCR accuracy.
 Optimized for speed with minimal quality loss.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
 import cv2
 import numpy as np
-from PIL import Image
-import io
-import fitz  # PyMuPDF
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _is_bilevel_png(image_bytes: bytes) -> bool:
+    """
+    Check the PNG header for a 1-bit grayscale image, without decoding it.
+    Bytes 24 and 25 hold the bit depth and colour type of the IHDR chunk,
+    which PNG requires to come first.
+    """
+    return (
+        len(image_bytes) > 25
+        and image_bytes.startswith(_PNG_SIGNATURE)
+        and image_bytes[12:16] == b'IHDR'
+        and image_bytes[24] == 1  # Bit depth
+        and image_bytes[25] == 0  # Colour type: grayscale
+    )
 
 class OCRPreprocessor:
     """
@@ -15,7 +32,8 @@ class OCRPreprocessor:
     Ultra-fast mode prioritizes speed over maximum quality.
     """
     
-    def preprocess_image(self, image_bytes: bytes, dpi: int = 150, ultra_fast: bool = True) -> bytes:
+    def preprocess_image(self, image_bytes: bytes, dpi: int = 150, ultra_fast: bool = True,
+                         encode: bool = True) -> Union[bytes, np.ndarray]:
         """
         Apply minimal preprocessing for maximum speed.
         
@@ -23,13 +41,39 @@ class OCRPreprocessor:
             image_bytes: Raw image bytes
             dpi: Target DPI for resizing (lower = faster)
             ultra_fast: If True, use ultra-fast preprocessing
+            encode: If True, return PNG bytes. If False, return the grayscale
+                array as-is, skipping the zlib-heavy PNG encode for in-process
+                consumers such as OCR engines.
             
         Returns:
-            Preprocessed image bytes
+            Preprocessed image as PNG bytes, or as a uint8 array if encode is False
         """
+        # A bilevel PNG comes out of the ultra-fast pipeline unchanged: the
+        # resize never enlarges and thresholding maps 0 and 255 to themselves.
+        # Hand back the original bytes instead of decoding and re-encoding
+        if ultra_fast and encode and self._ultra_fast_scale(min(dpi, 150)) >= 1.0 and _is_bilevel_png(image_bytes):
+            return image_bytes
+        
         # Convert bytes to OpenCV image
         image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
         
+        return self.preprocess_array(image, dpi=dpi, ultra_fast=ultra_fast, encode=encode)
+    
+    def preprocess_array(self, image: np.ndarray, dpi: int = 150, ultra_fast: bool = True,
+                         encode: bool = True) -> Union[bytes, np.ndarray]:
+        """
+        Apply the same preprocessing as preprocess_image to a decoded image.
+        
+        Args:
+            image: Grayscale uint8 array. It is overwritten in place, so pass
+                a copy if the original is still needed.
+            dpi: Target DPI for resizing (lower = faster)
+            ultra_fast: If True, use ultra-fast preprocessing
+            encode: If True, return PNG bytes, otherwise the processed array
+            
+        Returns:
+            Preprocessed image as PNG bytes, or as a uint8 array if encode is False
+        """
         if ultra_fast:
             # Ultra-fast preprocessing - minimal operations
             # Just resize to reasonable DPI and apply simple thresholding
@@ -41,6 +85,9 @@ class OCRPreprocessor:
             processed = self._fast_binarize_image(processed)
             processed = self._fast_resize_for_ocr(processed, min(dpi, 150))
         
+        if not encode:
+            return processed
+        
         # Convert back to bytes
         is_success, buffer = cv2.imencode(".png", processed)
         if not is_success:
@@ -48,11 +95,15 @@ class OCRPreprocessor:
             
         return buffer.tobytes()
     
-    def _ultra_fast_resize(self, image, target_dpi=150):
-        """Ultra-fast resizing using nearest neighbor."""
+    def _ultra_fast_scale(self, target_dpi=150):
+        """Scale factor applied by _ultra_fast_resize."""
         # Assuming standard DPI is 72
         current_dpi = 72
-        scale_factor = target_dpi / current_dpi
+        return target_dpi / current_dpi
+    
+    def _ultra_fast_resize(self, image, target_dpi=150):
+        """Ultra-fast resizing using nearest neighbor."""
+        scale_factor = self._ultra_fast_scale(target_dpi)
         
         if scale_factor >= 1.0:
             return image  # No upsizing needed
@@ -66,24 +117,28 @@ class OCRPreprocessor:
         return resized
     
     def _ultra_fast_binarize(self, image):
-        """Ultra-fast binarization using simple global thresholding."""
-        # Apply simple thresholding
-        _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        return binary
+        """Ultra-fast binarization using the global mean as threshold, in place."""
+        # The mean is one vectorised reduction, cheaper than Otsu's histogram
+        # search. Capping it below 255 keeps blank white pages white.
+        threshold = min(cv2.mean(image)[0], 254.0)
+        cv2.threshold(image, threshold, 255, cv2.THRESH_BINARY, dst=image)
+        return image
     
     def _fast_enhance_contrast(self, image):
-        """Fast contrast enhancement using simple histogram equalization."""
+        """Fast contrast enhancement using simple histogram equalization, in place."""
         # Apply histogram equalization
-        enhanced = cv2.equalizeHist(image)
-        return enhanced
+        cv2.equalizeHist(image, dst=image)
+        return image
     
     def _fast_binarize_image(self, image):
-        """Fast binarization using adaptive thresholding."""
-        # Apply adaptive thresholding with larger block size for speed
-        binary = cv2.adaptiveThreshold(
-            image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 21, 2
+        """Fast binarization using adaptive thresholding, in place."""
+        # Apply adaptive thresholding with larger block size for speed. The
+        # local means are computed into a separate buffer first, so writing
+        # the result over the input is safe
+        cv2.adaptiveThreshold(
+            image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 21, 2, dst=image
         )
-        return binary
+        return image
     
     def _fast_resize_for_ocr(self, image, target_dpi=150):
         """Fast resizing for OCR."""
@@ -114,35 +169,47 @@ def preprocess_scanned_pdf(pdf_path: str, output_path: str, ultra_fast: bool = T
     Returns:
         Path to the preprocessed PDF
     """
+    import fitz  # PyMuPDF, only needed for whole-PDF preprocessing
+
     doc = fitz.open(pdf_path)
     preprocessor = OCRPreprocessor()
     
     # For performance, only process first few pages in ultra-fast mode
     pages_to_process = range(min(5, len(doc))) if ultra_fast else range(len(doc))
     
-    for page_num in pages_to_process:
-        page = doc[page_num]
-        
-        # Get all images on the page
-        image_list = page.get_images()
-        
-        # Limit number of images processed in ultra-fast mode
-        images_to_process = image_list[:1] if ultra_fast else image_list[:3]
-        
-        # Process each image
-        for img_index, img in enumerate(images_to_process):
-            # Get the image XREF
-            xref = img[0]
-            
-            # Extract the image bytes
-            base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
-            
-            # Preprocess the image
-            processed_bytes = preprocessor.preprocess_image(image_bytes, ultra_fast=ultra_fast)
-            
-            # TODO: Replace the image in the PDF with the processed one
-            # This would require more complex PDF manipulation
+    # Pages are rendered straight to grayscale pixmaps, whose samples can be
+    # wrapped as an array without a PNG decode or extra copy. Rendering is
+    # serial, since PyMuPDF is not thread-safe; the OpenCV resize and
+    # threshold calls release the GIL, so each batch is processed in
+    # parallel. Working in batches of one page per worker bounds peak memory
+    # to a batch of pixmaps, whatever the page count.
+    render_dpi = 150
+    batch_size = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=batch_size) as executor:
+        for batch_start in range(0, len(pages_to_process), batch_size):
+            pixmaps = [
+                doc[page_num].get_pixmap(dpi=render_dpi, colorspace=fitz.csGRAY, alpha=False)
+                for page_num in pages_to_process[batch_start:batch_start + batch_size]
+            ]
+            # The arrays view the pixmaps' own memory and are processed in
+            # place, so the pixmaps stay referenced until the batch is done
+            futures = [
+                executor.submit(
+                    preprocessor.preprocess_array,
+                    np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width),
+                    dpi=render_dpi,
+                    ultra_fast=ultra_fast,
+                    encode=False,
+                )
+                for pix in pixmaps
+            ]
+            for future in futures:
+                # TODO: Replace the page in the PDF with the processed one,
+                # encoding the array once when embedding it. This would
+                # require more complex PDF manipulation; until then the
+                # result is dropped as soon as it is ready
+                future.result()
+            del pixmaps, futures
     
     # Save the (potentially) modified document
     doc.save(output_path)